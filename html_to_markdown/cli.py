@@ -41,14 +41,13 @@ def main():
         if len(html_content.encode('utf-8')) <= 5 * 1024:
             h2t = HTML2Text()
             h2t.ignore_links = False
-            markdown = h2t.handle(html_content)
+            args.output.write(h2t.handle(html_content))
         else:
             converter = HTMLToMarkdown(
                 filter_tags=args.filter_tags,
             )
-            markdown = converter.convert(html_content)
-            
-        args.output.write(markdown)
+            # Stream large documents straight to the output file
+            converter.convert_to(html_content, args.output)
     except KeyboardInterrupt:
         sys.exit(130)
     except Exception as e:
@@ -0,0 +1,23 @@
+# Static declarations for the optional Cython build of converter.py.
+# The .py file stays the single source; Cython merges this file in when
+# compiling, and plain Python ignores it.
+
+cdef class HTMLToMarkdown:
+    cdef public object filter_tags
+    cdef public frozenset _filter_set
+    cdef public object max_depth
+    cdef public object max_size
+    cdef public object custom_rules
+    cdef public object cache_size
+    cdef public object _cached_convert
+    cdef public object workers
+    cdef public object parser
+    cdef public object backend
+    cdef public object logger
+    cdef public dict _dispatch
+
+    # The tree walk: typed depths and direct C calls between these methods
+    cpdef _process_node(self, node, list parts, Py_ssize_t depth=*, Py_ssize_t list_depth=*, flush=*)
+    cpdef _handle_element(self, element, Py_ssize_t depth, Py_ssize_t list_depth)
+    cpdef str _process_inline(self, element)
+    cpdef str _clean_text(self, text)
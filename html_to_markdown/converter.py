@@ -1,109 +1,386 @@
 import re
 import logging
-from bs4 import BeautifulSoup, NavigableString, Comment
+import functools
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup, NavigableString, Comment, Tag
 from urllib.parse import quote
+from . import lxml_tree
+from .lxml_tree import Element
+
+# Shared by all instances; logging configuration is left to the application
+_logger = logging.getLogger('HTMLToMarkdown')
+
+# Prefer lxml's C parser when it is installed
+try:
+    import lxml
+    _DEFAULT_PARSER = 'lxml'
+except ImportError:
+    _DEFAULT_PARSER = 'html.parser'
+
+# Whitespace patterns used by _clean_text, compiled once at import time
+_CJK_SPACE_SUB = re.compile(r'([\u4e00-\u9fa5])\s+([\u4e00-\u9fa5])').sub
+_MULTI_SPACE_SUB = re.compile(r'[ \t]{2,}').sub
+
+# Characters quote(href, safe='/:#.') leaves untouched; hrefs made only of these skip quoting
+_URL_SAFE_MATCH = re.compile(r'[A-Za-z0-9_.\-~/:#]*\Z').match
+
+# Precomputed list indents, indexed by nesting depth
+_INDENTS = tuple('    ' * i for i in range(32))
+
+# data-* attributes that hold image sources rather than link metadata
+_EXCLUDED_DATA_ATTRS = frozenset(('data-src', 'data-original'))
+
+# Markdown separator cells for a header cell's align attribute
+_ALIGN_MAP = {'left': ':--', 'right': '--:', 'center': ':-:'}
+
+# Bare <code> class names taken as the fence language of a <pre> block
+_CODE_LANGUAGES = frozenset(('python', 'js', 'javascript', 'html', 'css', 'java', 'c', 'cpp'))
+
+@functools.lru_cache(maxsize=4096)
+def _quote_href(href):
+    # The same hrefs recur heavily within and across pages
+    return quote(href, safe='/:#.')
+
+def _text_of(node):
+    # Equivalent to node.get_text(): an element holding a single plain string
+    # (the usual <code>/<pre> body) returns it without walking descendants
+    text = node.string
+    if type(text) is NavigableString:
+        return text
+    return node.get_text()
+
+def _find_tags(root, names):
+    # Document-order equivalent of root.find_all(names) for plain tag names,
+    # walking .contents with an explicit stack instead of BeautifulSoup's filters
+    stack = [iter(root.contents)]
+    while stack:
+        for child in stack[-1]:
+            name = child.name
+            if name is None:
+                continue
+            if name in names:
+                yield child
+            stack.append(iter(child.contents))
+            break
+        else:
+            stack.pop()
+
+# Inline text after a part ending in one of these is joined without a space
+_NO_SPACE_AFTER = frozenset(' \n>([{')
+
+# Inputs at least this long are split across worker processes when workers is set
+_PARALLEL_THRESHOLD = 100000
+
+def _convert_fragment(options, fragment):
+    # Worker entry point. A re-parsed fragment lands under the same
+    # soup > html > body chain as the original, so depths line up.
+    converter = HTMLToMarkdown(**options)
+    soup = converter._parse(fragment)
+    converter._prune(soup)
+    parts = []
+    converter._process_node(soup, parts, depth=0)
+    return ''.join(parts)
+
+def _convert_document(options, html_content):
+    # Worker entry point for convert_batch: one whole document per task
+    return HTMLToMarkdown(**options)._convert(html_content)
+
+class _StreamWriter:
+    # Writes the parts list out in batches while keeping convert()'s framing:
+    # no leading or trailing whitespace, and a single final newline
+    __slots__ = ('_write', '_batch_size', '_started', '_pending')
+
+    def __init__(self, write, batch_size=256):
+        self._write = write
+        self._batch_size = batch_size
+        self._started = False
+        self._pending = ''
+
+    def flush(self, parts):
+        if len(parts) >= self._batch_size:
+            self._emit(parts)
+
+    def close(self, parts):
+        self._emit(parts)
+        if self._started:
+            self._write('\n')
+
+    def _emit(self, parts):
+        text = ''.join(parts)
+        parts.clear()
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return
+            self._started = True
+        body = text.rstrip()
+        if not body:
+            # Whitespace is only written once more text follows it
+            self._pending += text
+            return
+        self._write(self._pending + body)
+        self._pending = text[len(body):]
 
 class HTMLToMarkdown:
-    def __init__(self, filter_tags=None, max_depth=None, max_size=None, custom_rules=None):
+    # Fixed attribute layout: no per-instance __dict__, faster attribute access
+    __slots__ = (
+        'filter_tags', '_filter_set', 'max_depth', 'max_size', 'custom_rules',
+        'cache_size', '_cached_convert', 'workers', 'parser', 'backend', 'logger', '_dispatch',
+    )
+
+    def __init__(self, filter_tags=None, max_depth=None, max_size=None, custom_rules=None, cache_size=None, workers=None, parser=None, backend=None):
         self.filter_tags = filter_tags or ['script', 'style', 'noscript', 'meta', 'link', 'header', 'footer']
+        self._filter_set = frozenset(self.filter_tags)
         self.max_depth = max_depth
         self.max_size = max_size or 1000000
         self.custom_rules = custom_rules or {}
-        self._init_handlers()
-        
-        logging.basicConfig(level=logging.ERROR)
-        self.logger = logging.getLogger('HTMLToMarkdown')
-
-    def _init_handlers(self):
-        self.handlers = {
-            'br': self._handle_br,
-            'hr': self._handle_hr,
-            'img': self._handle_img,
-            'a': self._handle_a,
-            'strong': self._handle_strong,
-            'b': self._handle_strong,
-            'em': self._handle_em,
-            'i': self._handle_em,
-            'code': self._handle_code,
-            'pre': self._handle_pre,
-            'p': self._handle_p,
-            'blockquote': self._handle_blockquote,
-            'ul': self._handle_ul,
-            'ol': self._handle_ol,
-            'li': self._handle_li,
-            'table': self._handle_table,
-            'del': self._handle_del,
-            's': self._handle_del,
-            'strike': self._handle_del,
-            'tr': self._handle_tr,
-            'th': self._handle_th,
-            'td': self._handle_td,
+        # Built-in handlers merged with the custom rules, which take precedence.
+        # Handlers are looked up on the class so subclass overrides are used.
+        cls = type(self)
+        self._dispatch = {
+            **{tag: getattr(cls, handler.__name__) for tag, handler in self._HANDLERS.items()},
+            **{tag: (lambda self, element, *args, rule=rule: rule(element)) for tag, rule in self.custom_rules.items()},
         }
-        
-        # Fix: Add extra parameter support for title handling functions
-        for level in range(1, 7):
-            self.handlers[f'h{level}'] = lambda node, *args, l=level: self._handle_heading(node, l)
+        # Optional per-instance memo of convert() results, keyed on the input HTML
+        self.cache_size = cache_size
+        self._cached_convert = functools.lru_cache(maxsize=cache_size)(self._convert) if cache_size else None
+        # Number of processes used to convert the <body> of large inputs
+        self.workers = workers
+        # BeautifulSoup tree builder; html.parser is only the fallback
+        self.parser = parser or _DEFAULT_PARSER
+        # Tree backend: 'lxml' builds light Element trees straight from lxml's
+        # parser, 'bs4' builds BeautifulSoup trees. Custom rules and the other
+        # BeautifulSoup parsers get bs4 unless lxml is asked for.
+        if backend is None:
+            use_lxml = lxml_tree.etree is not None and self.parser == 'lxml' and not self.custom_rules
+            backend = 'lxml' if use_lxml else 'bs4'
+        elif backend not in ('lxml', 'bs4'):
+            raise ValueError(f"Unknown backend: {backend}")
+        elif backend == 'lxml' and lxml_tree.etree is None:
+            raise ValueError("The lxml backend requires lxml to be installed")
+        self.backend = backend
+        self.logger = _logger
 
     def convert(self, html_content):
+        self._check_input(html_content)
+        if self._cached_convert is not None:
+            return self._cached_convert(html_content)
+        return self._convert(html_content)
+
+    def convert_to(self, html_content, out):
+        # Stream the Markdown to out.write in batches instead of building one string
+        self._check_input(html_content)
+        writer = _StreamWriter(out.write)
+        parts = []
+        self._render(html_content, parts, writer.flush)
+        writer.close(parts)
+
+    def convert_batch(self, documents):
+        # Convert many documents at once; with workers set they are spread
+        # over that many processes instead of being converted one by one
+        documents = list(documents)
+        for html_content in documents:
+            self._check_input(html_content)
+        if not self.workers or self.custom_rules or len(documents) < 2:
+            convert = self._cached_convert or self._convert
+            return [convert(html_content) for html_content in documents]
+            
+        options = {
+            'filter_tags': self.filter_tags, 'max_depth': self.max_depth, 'max_size': self.max_size,
+            'parser': self.parser, 'backend': self.backend,
+        }
+        chunksize = -(-len(documents) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(_convert_document, itertools.repeat(options), documents, chunksize=chunksize))
+
+    def _check_input(self, html_content):
         if html_content is None:
             raise ValueError("Input HTML cannot be None")
-        if not isinstance(html_content, str):
-            raise ValueError("Input must be a string")
+        if not isinstance(html_content, (str, bytes)):
+            raise ValueError("Input must be a string or bytes")
         if self.max_size and len(html_content) > self.max_size:
             raise ValueError(f"Input HTML exceeds maximum size of {self.max_size} bytes")
+
+    def _convert(self, html_content):
+        # A single accumulator is threaded through the whole traversal
+        parts = []
+        self._render(html_content, parts)
+        result = ''.join(parts).strip()
+        return result + '\n' if result else ""
+
+    def _render(self, html_content, parts, flush=None):
+        soup = self._parse(html_content)
+        
+        # Split before pruning so workers see the same adjacent text nodes the serial walk would
+        fragments = None
+        if self.workers and len(html_content) >= _PARALLEL_THRESHOLD:
+            fragments = self._split_body(soup)
+        self._prune(soup)
+        
+        self._process_node(soup, parts, 0, 0, flush)
+        if fragments:
+            options = {'filter_tags': self.filter_tags, 'max_size': len(html_content), 'parser': self.parser, 'backend': self.backend}
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                for fragment in pool.map(_convert_fragment, itertools.repeat(options), fragments):
+                    parts.append(fragment)
+                    if flush is not None:
+                        flush(parts)
+
+    def _parse(self, html_content):
+        # Bytes are tried as UTF-8 first. Anything else goes to BeautifulSoup
+        # undecoded, so its encoding detection (BOMs, <meta charset>) can run.
+        if isinstance(html_content, bytes):
+            try:
+                html_content = html_content.decode('utf-8-sig')
+            except UnicodeDecodeError:
+                return self._parse_soup(html_content)
         
-        parser = 'lxml' if self.max_size and self.max_size > 50000 else 'html.parser'
+        if self.backend == 'lxml':
+            try:
+                return lxml_tree.parse(html_content, self._filter_set)
+            except Exception as e:
+                self.logger.error(f"Failed to parse HTML: {str(e)}")
+        return self._parse_soup(html_content)
+
+    def _parse_soup(self, html_content):
         try:
-            soup = BeautifulSoup(html_content, parser)
+            return BeautifulSoup(html_content, self.parser)
         except Exception as e:
+            if self.parser == 'html.parser':
+                raise
             self.logger.error(f"Failed to parse HTML: {str(e)}")
-            soup = BeautifulSoup(html_content, 'html.parser')
+            return BeautifulSoup(html_content, 'html.parser')
+
+    def _split_body(self, soup):
+        # Serialize <body>'s children into contiguous fragments for the worker
+        # processes and empty <body>, or return None if the tree can't be split
+        # safely. Custom rules may not be picklable, and body must come last in
+        # document order so its output can be appended after everything else.
+        body = soup.find('body')
+        if self.custom_rules or self.max_depth is not None or body is None:
+            return None
+        html = body.parent
+        if html is None or html.name != 'html' or html.parent is not soup:
+            return None
+        if body.next_sibling is not None or html.next_sibling is not None:
+            return None
         
-        for comment in soup.find_all(string=lambda t: isinstance(t, Comment)):
-            comment.extract()
-        for tag in self.filter_tags:
-            for element in soup.find_all(tag):
-                element.decompose()
-                
-        result = self._process_node(soup, depth=0).strip()
-        return result + '\n' if result else ""
+        children = body.contents
+        if children and type(children[0]) is not Tag and type(children[0]) is not Element and children[0].strip():
+            return None
+        
+        # Fragments only start at a tag: lxml would wrap leading text in a <p>
+        size = -(-len(children) // (self.workers * 4))
+        fragments = []
+        current = []
+        for child in children:
+            if len(current) >= size and child.name is not None:
+                fragments.append(lxml_tree.serialize(current))
+                current = []
+            current.append(child)
+        if current:
+            fragments.append(lxml_tree.serialize(current))
+        if len(fragments) < 2:
+            return None
+        
+        body.clear()
+        return fragments
+
+    def _prune(self, soup):
+        # Strip filtered tags in a single walk, never descending into removed subtrees
+        if type(soup) is Element:
+            # Element trees are built without them or comments
+            return
+        filter_set = self._filter_set
+        # The walk itself skips comments; they are only removed so that
+        # custom rules keep receiving comment-free subtrees
+        strip_comments = bool(self.custom_rules)
+        stack = [soup]
+        while stack:
+            for child in list(stack.pop().contents):
+                if isinstance(child, Comment):
+                    if strip_comments:
+                        child.extract()
+                elif child.name in filter_set:
+                    child.decompose()
+                elif child.name:
+                    stack.append(child)
 
-    def _process_node(self, node, depth=0, list_stack=None):
-        if self.max_depth is not None and depth > self.max_depth:
-            return "[...]"
+    def _process_node(self, node, parts, depth=0, list_depth=0, flush=None):
+        max_depth = self.max_depth
+        if max_depth is not None and depth > max_depth:
+            parts.append("[...]")
+            return
             
-        list_stack = list_stack or []
-        output = []
-        
-        for child in node.children:
-            try:
-                if isinstance(child, NavigableString):
-                    if not isinstance(child, Comment):
-                        text = self._clean_text(child.string)
+        dispatch = self._dispatch
+        # Tags without a handler (div, span, html, body, ...) are descended
+        # into in place: the iterator over the enclosing children and its
+        # depth are pushed here instead of recursing, so nesting depth costs
+        # no Python frames
+        stack = []
+        children = iter(node.contents)
+        while True:
+            for child in children:
+                # Exact type checks are cheaper than isinstance; every child that is
+                # not an element is a NavigableString (or a subclass such as Doctype or CData)
+                child_type = type(child)
+                if child_type is not Tag and child_type is not Element:
+                    # Whitespace-only strings, such as the formatting between tags, clean to nothing
+                    if child_type is not Comment and not child.isspace():
+                        text = self._clean_text(child)
                         if text:
-                            output.append(text)
-                else:
-                    result = self._handle_element(child, depth, list_stack)
+                            parts.append(text)
+                    continue
+                    
+                handler = dispatch.get(child.name)
+                if handler is None:
+                    if max_depth is not None and depth >= max_depth:
+                        parts.append("[...]")
+                        if flush is not None:
+                            flush(parts)
+                        continue
+                    # Unhandled containers stream their children straight into parts
+                    stack.append((children, depth))
+                    children = iter(child.contents)
+                    depth += 1
+                    break
+                    
+                mark = len(parts)
+                try:
+                    result = handler(self, child, depth, list_depth)
                     if result:
-                        output.append(result)
-            except Exception as e:
-                self.logger.error(f"Error processing node: {child.name if hasattr(child, 'name') else 'text'} - {str(e)}")
-                output.append(f"[Error: {child.name if hasattr(child, 'name') else 'text'}]")
-        
-        return ''.join(output)
+                        parts.append(result)
+                except Exception as e:
+                    # Drop whatever the failed child had already emitted
+                    del parts[mark:]
+                    self.logger.error(f"Error processing node: {child.name} - {str(e)}")
+                    parts.append(f"[Error: {child.name}]")
+                # Streaming hands finished output on between children
+                if flush is not None:
+                    flush(parts)
+            else:
+                # The current container is finished
+                if not stack:
+                    return
+                children, depth = stack.pop()
+                if flush is not None:
+                    flush(parts)
 
-    def _handle_element(self, element, depth, list_stack):
-        tag = element.name
-        if not tag:
-            return ""
-            
-        if tag in self.custom_rules:
-            return self.custom_rules[tag](element)
-            
-        if tag in self.handlers:
-            return self.handlers[tag](element, depth, list_stack)
-            
-        return self._process_node(element, depth + 1, list_stack)
+    def _render_node(self, node, depth=0, list_depth=0):
+        parts = []
+        self._process_node(node, parts, depth, list_depth)
+        return ''.join(parts)
+
+    def _handle_element(self, element, depth, list_depth):
+        # Used for the element children of inline content; _process_node
+        # dispatches its own children. One lookup covers custom rules and
+        # built-in handlers alike.
+        handler = self._dispatch.get(element.name)
+        if handler is None:
+            # Unhandled containers render their children in place
+            return self._render_node(element, depth + 1, list_depth)
+        return handler(self, element, depth, list_depth)
 
     # ====================
     # Tag Handlers (Fix multiple issues)
@@ -130,15 +407,40 @@ class HTMLToMarkdown:
         content = self._process_inline(node).strip()
         return f"\n{content}\n" if content else ""
 
-    def _handle_heading(self, node, level, *args):
+    # One method per level, with the marker written into the literal
+    def _handle_h1(self, node, *args):
+        content = self._process_inline(node).strip()
+        return f"\n# {content}\n\n"
+
+    def _handle_h2(self, node, *args):
+        content = self._process_inline(node).strip()
+        return f"\n## {content}\n\n"
+
+    def _handle_h3(self, node, *args):
         content = self._process_inline(node).strip()
-        return f"\n{'#' * level} {content}\n\n"
+        return f"\n### {content}\n\n"
+
+    def _handle_h4(self, node, *args):
+        content = self._process_inline(node).strip()
+        return f"\n#### {content}\n\n"
+
+    def _handle_h5(self, node, *args):
+        content = self._process_inline(node).strip()
+        return f"\n##### {content}\n\n"
+
+    def _handle_h6(self, node, *args):
+        content = self._process_inline(node).strip()
+        return f"\n###### {content}\n\n"
 
     def _handle_code(self, node, *args):
-        code = node.get_text()
+        # <pre> renders its own <code>; check before extracting any text
         if node.parent and node.parent.name == 'pre':
             return ""
-        return f"`{code.replace('`', '\\`')}`"
+        code = _text_of(node)
+        # Most code spans have no backticks to escape
+        if '`' in code:
+            code = code.replace('`', '\\`')
+        return f"`{code}`"
 
     def _handle_pre(self, node, *args):
         code = node.find('code')
@@ -149,12 +451,12 @@ class HTMLToMarkdown:
                 if cls.startswith('language-'):
                     lang = cls[9:]
                     break
-                elif cls in ['python', 'js', 'javascript', 'html', 'css', 'java', 'c', 'cpp']:
+                elif cls in _CODE_LANGUAGES:
                     lang = cls
                     break
-            code_text = code.get_text().strip()
+            code_text = _text_of(code).strip()
         else:
-            code_text = node.get_text().strip()
+            code_text = _text_of(node).strip()
             
         if not code_text:
             return ''
@@ -169,14 +471,21 @@ class HTMLToMarkdown:
             return text
             
         # Fix: Directly use the attribute name without the "data-" prefix
-        data_attrs = ' '.join(
-            f'{k}="{v}"' for k, v in node.attrs.items() 
-            if k.startswith('data-') and k not in ['data-src', 'data-original'] and v
-        )
+        # Most links carry nothing but href, which leaves no attributes to scan
+        attrs = node.attrs
+        data_attrs = ''
+        if len(attrs) > 1:
+            data_attrs = ' '.join(
+                f'{k}="{v}"' for k, v in attrs.items()
+                if k.startswith('data-') and k not in _EXCLUDED_DATA_ATTRS and v
+            )
+        
+        if not _URL_SAFE_MATCH(href):
+            href = _quote_href(href)
         
         if data_attrs:
-            return f"[{text}]({quote(href, safe='/:#.')} '{data_attrs}')"
-        return f"[{text}]({quote(href, safe='/:#.')})"
+            return f"[{text}]({href} '{data_attrs}')"
+        return f"[{text}]({href})"
 
     def _handle_img(self, node, *args):
         alt = node.get('alt', '').strip()
@@ -193,60 +502,62 @@ class HTMLToMarkdown:
             
         return f"![{alt}]({src}{size_attr})"
 
-    def _handle_ul(self, node, depth, list_stack):
-        return self._handle_list(node, depth, list_stack, ordered=False)
+    def _handle_ul(self, node, depth, list_depth):
+        return self._handle_list(node, depth, list_depth, ordered=False)
 
-    def _handle_ol(self, node, depth, list_stack):
-        return self._handle_list(node, depth, list_stack, ordered=True)
+    def _handle_ol(self, node, depth, list_depth):
+        return self._handle_list(node, depth, list_depth, ordered=True)
 
-    def _handle_list(self, node, depth, list_stack, ordered):
+    def _handle_list(self, node, depth, list_depth, ordered):
         items = []
-        indent_level = len(list_stack)
-        new_stack = list_stack + [{'ordered': ordered, 'indent': indent_level}]
+        indent = _INDENTS[list_depth] if list_depth < len(_INDENTS) else '    ' * list_depth
         
-        for i, item in enumerate(node.find_all('li', recursive=False)):
-            prefix = f"{i+1}. " if ordered else "- "
+        # Scan direct children once instead of building a find_all ResultSet
+        for i, item in enumerate((c for c in node.contents if c.name == 'li'), 1):
+            prefix = f"{i}. " if ordered else "- "
             # Add correct indentation before list item content
-            content = self._process_node(item, depth + 1, new_stack).strip()
+            content = self._render_node(item, depth + 1, list_depth + 1).strip()
             
             # Handle task list items
             if '[x]' in content[:4] or '[ ]' in content[:4]:
-                items.append(f"{'    ' * indent_level}{content}")
+                items.append(f"{indent}{content}")
             else:
                 # Regular list item
-                items.append(f"{'    ' * indent_level}{prefix}{content}")
+                items.append(f"{indent}{prefix}{content}")
         
         return '\n'.join(items) + '\n\n'
 
-    def _handle_li(self, node, depth, list_stack):
+    def _handle_li(self, node, depth, list_depth):
         # Directly process list item content
-        return self._process_node(node, depth, list_stack)
+        return self._render_node(node, depth, list_depth)
 
     def _handle_blockquote(self, node, *args):
-        content = self._process_node(node).strip()
+        content = self._render_node(node).strip()
         if not content:
             return ""
-        quoted = '\n'.join(f"> {line}" for line in content.split('\n'))
+        quoted = '> ' + content.replace('\n', '\n> ')
         # Fix: Ensure block quotes have correct line breaks
         return f"\n{quoted}\n\n"
 
     def _handle_table(self, node, *args):
-        header_row = node.find('tr')
-        if not header_row:
+        tr_iter = _find_tags(node, ('tr',))
+        header_row = next(tr_iter, None)
+        if header_row is None:
             return ""
             
         headers = []
         alignments = []
-        for th in header_row.find_all(['th', 'td']):
+        # Cells are direct children of their row; a cell's own content is never searched
+        for th in (c for c in header_row.contents if c.name == 'th' or c.name == 'td'):
             headers.append(self._process_inline(th).strip())
             align = th.get('align', '').lower()
-            align_map = {'left': ':--', 'right': '--:', 'center': ':-:'}
             # Fix: Add default alignment
-            alignments.append(align_map.get(align, '---'))
+            alignments.append(_ALIGN_MAP.get(align, '---'))
         
         rows = []
-        for tr in node.find_all('tr')[1:]:
-            cells = [self._process_inline(td).strip() for td in tr.find_all('td')]
+        # The remaining rows come from the same walk that produced the header row
+        for tr in tr_iter:
+            cells = [self._process_inline(td).strip() for td in tr.contents if td.name == 'td']
             if cells:
                 rows.append(cells)
         
@@ -271,40 +582,86 @@ class HTMLToMarkdown:
     # Helper Methods (Fix space handling)
     # ====================
     def _process_inline(self, element):
+        # Fast path for the common leaf case such as <strong>text</strong>
+        contents = element.contents
+        if len(contents) == 1 and type(contents[0]) is NavigableString:
+            return self._clean_text(contents[0])
+            
         parts = []
-        for child in element.children:
-            if isinstance(child, NavigableString):
-                if not isinstance(child, Comment):
-                    text = self._clean_text(child.string)
-                    if text:
-                        # Optimize: More intelligent space handling
-                        if parts and not parts[-1].endswith((' ', '\n', '>', '(', '[', '{')):
-                            parts.append(' ')
-                        parts.append(text)
-            else:
-                result = self._handle_element(child, 0, [])
+        # Last character of parts[-1] ('' if it is empty); starting at '\n'
+        # makes the checks below act as if there were no parts yet
+        last = '\n'
+        for child in contents:
+            child_type = type(child)
+            if child_type is Tag or child_type is Element:
+                result = self._handle_element(child, 0, 0)
                 if result:
                     # Optimize: Remove redundant spaces
-                    if parts and parts[-1].endswith(' ') and result.startswith(' '):
+                    if last == ' ' and result.startswith(' '):
                         result = result.lstrip()
                     parts.append(result)
+                    last = result[-1:]
+            elif child_type is not Comment and not child.isspace():
+                text = self._clean_text(child.string)
+                if text:
+                    # Optimize: More intelligent space handling
+                    if last not in _NO_SPACE_AFTER:
+                        parts.append(' ')
+                    parts.append(text)
+                    last = text[-1]
         return ''.join(parts).strip()
 
     def _clean_text(self, text):
         if not text:
             return ""
         
+        # Plain ASCII without a run of spaces or tabs has nothing to collapse or convert
+        if text.isascii() and '\t' not in text and '  ' not in text:
+            return text.strip()
+        
         # Preserve spaces between Chinese characters
-        text = re.sub(r'([\u4e00-\u9fa5])\s+([\u4e00-\u9fa5])', r'\1\2', text)
+        text = _CJK_SPACE_SUB(r'\1\2', text)
         
         # Compress consecutive spaces but keep line breaks
-        text = re.sub(r'[ \t]{2,}', ' ', text)
-        
-        # Remove leading/trailing spaces
-        text = text.strip()
+        text = _MULTI_SPACE_SUB(' ', text)
         
         # Convert special spaces
         text = text.replace('\u00a0', ' ')  # &nbsp;
         text = text.replace('\u200b', '')   # zero-width space
         
-        return text
\ No newline at end of file
+        # Remove leading/trailing spaces last, so none are left behind a zero-width space
+        return text.strip()
+
+    # ====================
+    # Tag dispatch table, built once at class creation
+    # ====================
+    _HANDLERS = {
+        'br': _handle_br,
+        'hr': _handle_hr,
+        'img': _handle_img,
+        'a': _handle_a,
+        'strong': _handle_strong,
+        'b': _handle_strong,
+        'em': _handle_em,
+        'i': _handle_em,
+        'code': _handle_code,
+        'pre': _handle_pre,
+        'p': _handle_p,
+        'blockquote': _handle_blockquote,
+        'ul': _handle_ul,
+        'ol': _handle_ol,
+        'li': _handle_li,
+        'table': _handle_table,
+        'del': _handle_del,
+        's': _handle_del,
+        'strike': _handle_del,
+        'tr': _handle_tr,
+        'th': _handle_th,
+        'td': _handle_td,
+        'h1': _handle_h1,
+        'h2': _handle_h2,
+        'h3': _handle_h3,
+        'h4': _handle_h4,
+        'h5': _handle_h5,
+        'h6': _handle_h6,
+    }
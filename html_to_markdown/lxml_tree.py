@@ -0,0 +1,280 @@
+from bs4 import NavigableString, CData, Doctype, ProcessingInstruction, Tag, BeautifulSoup
+from bs4.builder import HTMLTreeBuilder
+from bs4.formatter import HTMLFormatter
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# Tree-building rules shared with BeautifulSoup's HTML builders, so both backends see the same tree
+_MULTI_VALUED_ATTRS = HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+_UNIVERSAL_MULTI_VALUED = _MULTI_VALUED_ATTRS.get('*', frozenset())
+_PRESERVE_WHITESPACE = HTMLTreeBuilder.DEFAULT_PRESERVE_WHITESPACE_TAGS
+_STRING_CONTAINERS = HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS
+# Tag.MAIN_CONTENT_STRING_TYPES is new in bs4 4.13; earlier releases hardcode the same pair
+_MAIN_STRING_TYPES = tuple(getattr(Tag, 'MAIN_CONTENT_STRING_TYPES', (NavigableString, CData)))
+_ASCII_SPACES = BeautifulSoup.ASCII_SPACES
+
+# Elements serialized without an end tag
+_VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+    'link', 'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound',
+    'command', 'frame', 'image', 'isindex', 'nextid', 'spacer',
+))
+
+_TEXT_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+# Passed as an object: looking a formatter up by name needs a bs4.Tag parent
+_MINIMAL_FORMATTER = HTMLFormatter.REGISTRY['minimal']
+
+class Element:
+    # A lightweight stand-in for bs4.Tag, covering the part of its API the
+    # converter and typical custom rules use. Text children are real
+    # NavigableString objects.
+    __slots__ = ('name', 'attrs', 'contents', 'parent')
+
+    def __init__(self, name, attrs=None, parent=None):
+        self.name = name
+        self.attrs = {} if attrs is None else attrs
+        self.contents = []
+        self.parent = parent
+
+    def __bool__(self):
+        return True
+
+    def __len__(self):
+        return len(self.contents)
+
+    def __iter__(self):
+        return iter(self.contents)
+
+    def __getitem__(self, key):
+        return self.attrs[key]
+
+    def __repr__(self):
+        return self.decode()
+
+    __str__ = __repr__
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    def has_attr(self, key):
+        return key in self.attrs
+
+    @property
+    def children(self):
+        return iter(self.contents)
+
+    @property
+    def descendants(self):
+        stack = [iter(self.contents)]
+        while stack:
+            for child in stack[-1]:
+                yield child
+                if type(child) is Element:
+                    stack.append(iter(child.contents))
+                    break
+            else:
+                stack.pop()
+
+    @property
+    def next_sibling(self):
+        if self.parent is None:
+            return None
+        siblings = self.parent.contents
+        index = next(i for i, child in enumerate(siblings) if child is self) + 1
+        return siblings[index] if index < len(siblings) else None
+
+    @property
+    def string(self):
+        # Same rule as Tag.string: the lone string child, looking through single-child tags
+        node = self
+        while len(node.contents) == 1:
+            child = node.contents[0]
+            if type(child) is not Element:
+                return child
+            node = child
+        return None
+
+    def get_text(self, separator='', strip=False):
+        # Like Tag.get_text(): only the string types that count as this tag's content
+        types = _STRING_CONTAINERS.get(self.name)
+        types = (types,) if types is not None else _MAIN_STRING_TYPES
+        strings = (s for s in self.descendants if type(s) in types)
+        if strip:
+            strings = (s for s in (s.strip() for s in strings) if s)
+        return separator.join(strings)
+
+    text = property(get_text)
+
+    def find(self, name, recursive=True):
+        return next(self._iter_named(name, recursive), None)
+
+    def find_all(self, name, recursive=True):
+        return list(self._iter_named(name, recursive))
+
+    def _iter_named(self, name, recursive):
+        names = (name,) if isinstance(name, str) else name
+        nodes = self.descendants if recursive else self.contents
+        return (node for node in nodes if type(node) is Element and node.name in names)
+
+    def clear(self):
+        self.contents.clear()
+
+    def decode(self):
+        # HTML for this element, which parses back to the same tree
+        parts = []
+        self._decode_into(parts)
+        return ''.join(parts)
+
+    def _decode_into(self, parts):
+        parts.append(f'<{self.name}')
+        for key, value in self.attrs.items():
+            if isinstance(value, list):
+                value = ' '.join(value)
+            value = value.translate(_TEXT_ESCAPE).replace('"', '&quot;')
+            parts.append(f' {key}="{value}"')
+        parts.append('>')
+        if self.name in _VOID_ELEMENTS and not self.contents:
+            return
+        _serialize_into(self.contents, parts)
+        parts.append(f'</{self.name}>')
+
+def _serialize_into(nodes, parts):
+    previous_text = False
+    for node in nodes:
+        if type(node) is Element:
+            node._decode_into(parts)
+            previous_text = False
+        elif type(node) is Tag:
+            parts.append(node.decode())
+            previous_text = False
+        else:
+            if previous_text:
+                # Strings split by a removed comment or tag would re-parse as one
+                parts.append('<!---->')
+            # str() on a NavigableString returns it unescaped
+            parts.append(node.output_ready(_MINIMAL_FORMATTER))
+            previous_text = True
+
+def serialize(nodes):
+    # HTML for a run of sibling nodes, Element or bs4 alike, that parses back to the same nodes
+    parts = []
+    _serialize_into(nodes, parts)
+    return ''.join(parts)
+
+class _TreeBuilder:
+    # lxml parser target that builds Element trees the way BeautifulSoup's
+    # lxml builder would, dropping comments and filtered tags as they arrive
+    __slots__ = ('root', '_current', '_filter_set', '_data', '_skipping', '_preserve_whitespace', '_containers')
+
+    def __init__(self, filter_set):
+        self.root = Element('[document]')
+        self._current = self.root
+        self._filter_set = filter_set
+        self._data = []
+        # Nesting depth inside a filtered tag, whose whole subtree is skipped
+        self._skipping = 0
+        self._preserve_whitespace = 0
+        self._containers = []
+
+    def start(self, tag, attrib):
+        if self._skipping:
+            self._skipping += 1
+            return
+        if self._data:
+            self._end_data()
+        if tag in self._filter_set:
+            self._skipping = 1
+            return
+
+        # lxml passes attribute-less tags a shared empty mapping, which is slow to copy
+        attrs = dict(attrib) if attrib else {}
+        if attrs:
+            tag_specific = _MULTI_VALUED_ATTRS.get(tag.lower())
+            for key in attrs:
+                if key in _UNIVERSAL_MULTI_VALUED or (tag_specific and key in tag_specific):
+                    attrs[key] = attrs[key].split()
+
+        element = Element(tag, attrs, self._current)
+        self._current.contents.append(element)
+        self._current = element
+        if tag in _PRESERVE_WHITESPACE:
+            self._preserve_whitespace += 1
+        if tag in _STRING_CONTAINERS:
+            self._containers.append(tag)
+
+    def end(self, tag):
+        if self._skipping:
+            self._skipping -= 1
+            return
+        if self._data:
+            self._end_data()
+        # Close up to the most recent open tag with this name, if there is one
+        node = self._current
+        while node is not self.root and node.name != tag:
+            node = node.parent
+        if node is self.root:
+            return
+        while True:
+            element = self._current
+            self._current = element.parent
+            if element.name in _PRESERVE_WHITESPACE:
+                self._preserve_whitespace -= 1
+            if element.name in _STRING_CONTAINERS:
+                self._containers.pop()
+            if element is node:
+                break
+
+    def data(self, data):
+        if not self._skipping:
+            self._data.append(data)
+
+    def comment(self, text):
+        # Comments are never converted, but still end the text before them
+        if not self._skipping and self._data:
+            self._end_data()
+
+    def doctype(self, name, pubid, system):
+        if not self._skipping:
+            if self._data:
+                self._end_data()
+            # Through _end_data like any other string, so an empty doctype collapses as in bs4
+            self._data.append(str(Doctype.for_name_and_ids(name, pubid, system)))
+            self._end_data(Doctype)
+
+    def pi(self, target, data):
+        if not self._skipping:
+            if self._data:
+                self._end_data()
+            self._data.append(target + ' ' + data)
+            self._end_data(ProcessingInstruction)
+
+    def close(self):
+        if self._data:
+            self._end_data()
+        return self.root
+
+    def _end_data(self, string_class=None):
+        data = self._data
+        text = data[0] if len(data) == 1 else ''.join(data)
+        data.clear()
+        # Whitespace-only runs outside <pre>/<textarea> collapse to one character
+        if not self._preserve_whitespace and not text.strip(_ASCII_SPACES):
+            text = '\n' if '\n' in text else ' '
+        if string_class is None:
+            string_class = _STRING_CONTAINERS[self._containers[-1]] if self._containers else NavigableString
+        string = string_class(text)
+        string.parent = self._current
+        self._current.contents.append(string)
+
+def parse(html_content, filter_set=frozenset()):
+    # Build an Element tree straight from lxml's parser events, skipping
+    # BeautifulSoup's per-node bookkeeping. Comments and tags in filter_set
+    # are left out of the tree.
+    if html_content.startswith('\ufeff'):
+        html_content = html_content[1:]
+    parser = etree.HTMLParser(target=_TreeBuilder(filter_set), recover=True)
+    parser.feed(html_content)
+    return parser.close()
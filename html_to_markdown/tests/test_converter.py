@@ -1,3 +1,6 @@
+import collections
+import io
+import types
 import unittest
 from html_to_markdown.converter import HTMLToMarkdown
 
@@ -67,7 +70,35 @@ class TestHTMLToMarkdown(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.converter.convert(123)
         self.assertEqual(self.converter.convert(""), "")
+        self.assertEqual(self.converter.convert("<p>Café</p>".encode('utf-8')), "Café\n")
+        # Bytes that are not UTF-8 get BeautifulSoup's encoding detection on either backend
+        for backend in ('lxml', 'bs4'):
+            converter = HTMLToMarkdown(backend=backend)
+            self.assertEqual(converter.convert("<p>Café</p>".encode('utf-16')), "Café\n")
+            html = b'<html><head><meta charset="iso-8859-1"></head><body><p>Caf\xe9</p></body></html>'
+            self.assertEqual(converter.convert(html), "Café\n")
+
+    def test_parser_option(self):
+        """Test selecting the BeautifulSoup parser"""
+        converter = HTMLToMarkdown(parser='html.parser')
+        html = "<p>Paragraph with <strong>bold</strong></p>"
+        self.assertEqual(converter.convert(html), self.converter.convert(html))
+        # BeautifulSoup also takes a list of features
+        self.assertEqual(HTMLToMarkdown(parser=['html.parser']).convert(html), self.converter.convert(html))
         
+    def test_backends(self):
+        """Test that the lxml tree backend matches the BeautifulSoup one"""
+        html = "<h1>T</h1><p>a<!-- c -->b <code>x</code></p><pre><code class='python'>p</code></pre><ul><li>i</li></ul>"
+        lxml_converter = HTMLToMarkdown(backend='lxml')
+        self.assertEqual(lxml_converter.convert(html), HTMLToMarkdown(backend='bs4').convert(html))
+        self.assertEqual(lxml_converter.convert(html.encode('utf-8')), lxml_converter.convert(html))
+        custom_rules = {'custom-tag': lambda node: f"✨{node.get_text()}✨"}
+        self.assertEqual(HTMLToMarkdown(custom_rules=custom_rules).backend, 'bs4')
+        converter = HTMLToMarkdown(custom_rules=custom_rules, backend='lxml')
+        self.assertEqual(converter.convert("<custom-tag>Special</custom-tag>").strip(), "✨Special✨")
+        with self.assertRaises(ValueError):
+            HTMLToMarkdown(backend='dom')
+
     def test_tables(self):
         """Test conversion of HTML tables"""
         test_cases = [
@@ -104,6 +135,8 @@ class TestHTMLToMarkdown(unittest.TestCase):
         html = "<p>Paragraph with <strong>bold</strong> and <em>italic</em></p>"
         expected = "\nParagraph with **bold** and *italic*\n"
         self.assertEqual(self.converter.convert(html).strip(), expected.strip())
+        # A zero-width space leaves no whitespace behind at the edge of a text node
+        self.assertEqual(self.converter.convert("<div>a \u200b<b>x</b></div>"), "a **x**\n")
         
     def test_line_breaks(self):
         """Test conversion of line breaks"""
@@ -117,12 +150,64 @@ class TestHTMLToMarkdown(unittest.TestCase):
         expected = "\n---\n\n\nContent\n\n---\n\n"
         self.assertEqual(self.converter.convert(html).strip(), expected.strip())
         
+    def test_filtered_tags_and_comments(self):
+        """Test removal of filtered tags and HTML comments"""
+        html = "<script>alert(1)</script><div><style>p {}</style><!-- note --><p>Text</p></div>"
+        self.assertEqual(self.converter.convert(html), "Text\n")
+        self.assertEqual(HTMLToMarkdown(backend='bs4').convert("<div>a<!-- note -->b</div>"), "ab\n")
+        converter = HTMLToMarkdown(filter_tags=['span'])
+        html = "<p>Keep <span>drop <b>this</b></span>me</p>"
+        self.assertEqual(converter.convert(html), "Keep me\n")
+
     def test_max_depth(self):
         """Test maximum depth handling"""
         converter = HTMLToMarkdown(max_depth=2)
         html = "<div><div><div>Deep content</div></div></div>"
         self.assertIn("[...]", converter.convert(html))
+        # Without a limit, nesting deeper than the recursion limit still converts
+        html = "<div>" * 3000 + "Deep content" + "</div>" * 3000
+        self.assertEqual(self.converter.convert(html), "Deep content\n")
         
+    def test_result_cache(self):
+        """Test memoization of repeated conversions"""
+        converter = HTMLToMarkdown(cache_size=8)
+        html = "<p>Cached <a href='/a b'>link</a></p>"
+        first = converter.convert(html)
+        self.assertEqual(converter.convert(html), first)
+        self.assertEqual(first, self.converter.convert(html))
+        self.assertEqual(converter._cached_convert.cache_info().hits, 1)
+
+    def test_parallel_conversion(self):
+        """Test that multi-process conversion matches serial output"""
+        body = ''.join(
+            f"<h2>Section {i}</h2><p>Text with <a href='/p/{i}'>link</a></p><ul><li>a</li><li>b</li></ul>"
+            for i in range(1500)
+        )
+        html = f"<html><head><title>T</title></head><body>{body}</body></html>"
+        converter = HTMLToMarkdown(workers=2)
+        self.assertEqual(converter.convert(html), self.converter.convert(html))
+
+    def test_convert_batch(self):
+        """Test batch conversion, serial and across worker processes"""
+        documents = [f"<h2>Doc {i}</h2><p>Text <em>{i}</em></p>" for i in range(20)] + [b"<p>Bytes</p>", ""]
+        expected = [self.converter.convert(html) for html in documents]
+        self.assertEqual(self.converter.convert_batch(documents), expected)
+        self.assertEqual(HTMLToMarkdown(workers=2).convert_batch(iter(documents)), expected)
+        with self.assertRaises(ValueError):
+            self.converter.convert_batch(["<p>ok</p>", None])
+
+    def test_convert_to_stream(self):
+        """Test that streaming output matches convert()"""
+        test_cases = [
+            "",
+            "  <p> </p> ",
+            "<h1>Title</h1><div><p>One</p><div><p>Two</p></div></div>   <ul><li>Item</li></ul>",
+        ]
+        for html in test_cases:
+            buf = io.StringIO()
+            self.converter.convert_to(html, buf)
+            self.assertEqual(buf.getvalue(), self.converter.convert(html))
+
     def test_custom_rules(self):
         """Test custom conversion rules"""
         custom_rules = {
@@ -131,6 +216,17 @@ class TestHTMLToMarkdown(unittest.TestCase):
         converter = HTMLToMarkdown(custom_rules=custom_rules)
         html = "<custom-tag>Special</custom-tag>"
         self.assertEqual(converter.convert(html).strip(), "✨Special✨")
+        # Custom rules take precedence over the built-in handlers
+        converter = HTMLToMarkdown(custom_rules={'p': lambda node: f"<{node.get_text()}>"})
+        self.assertEqual(converter.convert("<p>One</p><div>Two</div>"), "<One>Two\n")
+        # Handler methods overridden in a subclass replace the built-in ones
+        class Converter(HTMLToMarkdown):
+            def _handle_p(self, node, *args):
+                return f"[{node.get_text()}]\n\n"
+        self.assertEqual(Converter().convert("<p>One</p><div>Two</div>"), "[One]\n\nTwo\n")
+        # Any mapping works, not only a plain dict
+        for rules in (collections.OrderedDict(custom_rules), types.MappingProxyType(custom_rules)):
+            self.assertEqual(HTMLToMarkdown(custom_rules=rules).convert(html).strip(), "✨Special✨")
 
 if __name__ == '__main__':
     unittest.main()
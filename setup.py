@@ -1,4 +1,31 @@
 from setuptools import setup, find_packages
+from setuptools.command.build_ext import build_ext
+
+class OptionalBuildExt(build_ext):
+    """Compile the converter when a C toolchain is available, otherwise keep the pure Python module"""
+
+    def run(self):
+        try:
+            super().run()
+        except Exception as e:
+            print(f"Skipping compiled converter: {e}")
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except Exception as e:
+            print(f"Skipping compiled converter: {e}")
+
+# The compiled converter is optional: without Cython the package installs as pure Python
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        ["html_to_markdown/converter.py"],
+        compiler_directives={'language_level': 3},
+        quiet=True,
+    )
+except ImportError:
+    ext_modules = []
 
 setup(
     name="html-to-markdown",
@@ -12,6 +39,11 @@ setup(
         "lxml>=4.9.3",
         "html2text==2020.1.16"
     ],
+    extras_require={
+        "speedups": ["cython>=3.0"],
+    },
+    ext_modules=ext_modules,
+    cmdclass={'build_ext': OptionalBuildExt},
     python_requires=">=3.7",
     classifiers=[
         "Development Status :: 3 - Alpha",